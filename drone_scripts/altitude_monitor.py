@@ -11,12 +11,13 @@ from dronekit import connect
 from pymavlink import mavutil
 import time
 import json
+from mavlink_helpers import set_message_interval
 
 
-def get_raw_altitude(master):
-    """Get raw altitude from LOCAL_POSITION_NED"""
+def get_raw_altitude(master, timeout):
+    """Wait up to timeout seconds for the next LOCAL_POSITION_NED altitude"""
     try:
-        msg = master.recv_match(type='LOCAL_POSITION_NED', blocking=False, timeout=0.01)
+        msg = master.recv_match(type='LOCAL_POSITION_NED', blocking=True, timeout=timeout)
         if msg:
             return -msg.z  # Negative Z is altitude (NED frame)
     except Exception:
@@ -44,6 +45,11 @@ def altitude_monitoring():
         print "Connected successfully"
         time.sleep(1)
 
+        # Only altitude is read here: get it at a steady 50 Hz
+        set_message_interval(vehicle._master,
+                             mavutil.mavlink.MAVLINK_MSG_ID_LOCAL_POSITION_NED,
+                             20000)
+
         # Flush any stale messages from the buffer
         print "Flushing message buffer..."
         for _ in range(10):
@@ -63,11 +69,12 @@ def altitude_monitoring():
         print ""
 
         while True:
+            # Block until the next reading, but no later than the next update
+            # (short wait while overdue, i.e. no samples arrived yet)
+            time_left = UPDATE_INTERVAL - (time.time() - last_update_time)
+            raw_alt = get_raw_altitude(vehicle._master, max(time_left, 0.01))
             current_time = time.time()
 
-            # Get raw altitude reading
-            raw_alt = get_raw_altitude(vehicle._master)
-
             if raw_alt is not None:
                 # Set home altitude on first reading
                 if home_altitude is None:
@@ -100,9 +107,6 @@ def altitude_monitoring():
                     altitude_samples = []
                     last_update_time = current_time
 
-            # High-speed sampling for fast response
-            time.sleep(0.02)  # 50Hz sampling rate
-
     except KeyboardInterrupt:
         print "\nStopping altitude monitoring..."
 
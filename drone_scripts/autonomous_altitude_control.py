@@ -14,6 +14,11 @@ import termios
 import time
 import select
 from flight_constants import *
+from mavlink_helpers import (emergency_disarm, recv_latest, release_rc_override,
+                             set_message_interval, wait_disarmed)
+
+# Separator line for the status banners
+BANNER = "=" * 60
 
 
 def set_rc_override(master, channels):
@@ -26,13 +31,14 @@ def set_rc_override(master, channels):
     )
 
 
-def release_rc_override(master):
-    """Release RC override"""
-    master.mav.rc_channels_override_send(
-        master.target_system,
-        master.target_component,
-        0, 0, 0, 0, 0, 0, 0, 0
-    )
+def hold_override(master, channels, duration):
+    """Hold RC override channels for duration seconds, re-sending before it times out"""
+    deadline = time.time() + duration
+    remaining = duration
+    while remaining > 0:
+        set_rc_override(master, channels)
+        time.sleep(min(RC_OVERRIDE_REFRESH_RATE, remaining))
+        remaining = deadline - time.time()
 
 
 def arm_throttle(master):
@@ -47,8 +53,7 @@ def disarm_throttle(master):
     """Disarm the drone throttle"""
     print "Disarming throttle..."
     master.arducopter_disarm()
-    master.motors_disarmed_wait()
-    print "DISARMED"
+    wait_disarmed(master)
 
 
 def set_mode(master, mode):
@@ -69,13 +74,22 @@ def set_mode(master, mode):
         mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED,
         mode_id
     )
-    print "Mode set to %s" % mode
+
+    # Wait for a HEARTBEAT confirming the new mode instead of a fixed delay
+    deadline = time.time() + 3
+    while time.time() < deadline:
+        heartbeat = master.recv_match(type='HEARTBEAT', blocking=True,
+                                      timeout=deadline - time.time())
+        if heartbeat and master.flightmode == mode:
+            print "Mode set to %s" % mode
+            return
+    print "WARNING: Mode change to %s not confirmed" % mode
 
 
 def get_altitude(master):
-    """Get current altitude from LOCAL_POSITION_NED"""
+    """Get current altitude from the newest queued LOCAL_POSITION_NED"""
     try:
-        msg = master.recv_match(type='LOCAL_POSITION_NED', blocking=False, timeout=0.01)
+        msg = recv_latest(master, 'LOCAL_POSITION_NED')
         if msg:
             return -msg.z  # Negative Z is altitude (NED frame)
     except:
@@ -121,9 +135,9 @@ def autonomous_flight():
     """
     Main autonomous altitude control function
     """
-    print "="*60
+    print BANNER
     print "AUTONOMOUS ALTITUDE CONTROL - INTEL AERO"
-    print "="*60
+    print BANNER
     print ""
     print "WARNING: Ensure drone is secured and area is clear!"
     print ""
@@ -153,13 +167,17 @@ def autonomous_flight():
         master = mavutil.mavlink_connection(SERIAL_PORT, baud=BAUD_RATE)
         master.wait_heartbeat()
         print "Connected! System %u Component %u" % (master.target_system, master.target_component)
+
+        # Stream altitude at the control loop rate instead of the default rate
+        set_message_interval(master,
+                             mavutil.mavlink.MAVLINK_MSG_ID_LOCAL_POSITION_NED,
+                             int(ALTITUDE_SAMPLE_RATE * 1e6))
         time.sleep(1)
 
         # ============================================================
         # INITIALIZATION PHASE
         # ============================================================
         set_mode(master, FLIGHT_MODE)
-        time.sleep(1)
 
         arm_throttle(master)
         time.sleep(1)
@@ -169,14 +187,14 @@ def autonomous_flight():
         # ============================================================
         # READY STATE
         # ============================================================
-        print "\n" + "="*60
+        print "\n" + BANNER
         print "READY TO FLY"
-        print "="*60
+        print BANNER
         print "Controls:"
         print "  Y = Start autonomous flight"
         print "  X = Controlled landing (during flight)"
         print "  Z = Emergency shutdown"
-        print "="*60
+        print BANNER
         print ""
 
         # Set motors to minimum (armed but not spinning)
@@ -192,10 +210,10 @@ def autonomous_flight():
         # ============================================================
         # TAKEOFF PHASE
         # ============================================================
-        print "\n" + "="*60
+        print "\n" + BANNER
         print "STARTING AUTONOMOUS FLIGHT"
         print "Target altitude: %.2f meters" % target_altitude
-        print "="*60
+        print BANNER
         print ""
 
         flight_start_time = time.time()
@@ -273,16 +291,16 @@ def autonomous_flight():
 
                     # X = Start landing
                     if ch.upper() == 'X':
-                        print "\n" + "="*60
+                        print "\n" + BANNER
                         print "LANDING INITIATED"
-                        print "="*60
+                        print BANNER
                         break
 
                     # Z = Emergency shutdown
                     elif ch.upper() == 'Z':
-                        print "\n" + "="*60
+                        print "\n" + BANNER
                         print "EMERGENCY SHUTDOWN"
-                        print "="*60
+                        print BANNER
                         raise KeyboardInterrupt
 
                 # Sample at high rate
@@ -314,11 +332,11 @@ def autonomous_flight():
                 if relative_alt < LANDING_ALTITUDE_THRESHOLD:
                     print "\nNear ground - reducing to minimum throttle..."
                     rc_channels[2] = THROTTLE_MIN
-                    set_rc_override(master, rc_channels)
-                    time.sleep(2)
+                    hold_override(master, rc_channels, 2)
                     break
 
-            time.sleep(STATUS_UPDATE_RATE)
+            # Keep the override alive so the FC does not fall back to RC input
+            hold_override(master, rc_channels, STATUS_UPDATE_RATE)
 
         # ============================================================
         # SHUTDOWN PHASE
@@ -332,24 +350,20 @@ def autonomous_flight():
         # Print summary
         if flight_start_time:
             flight_duration = time.time() - flight_start_time
-            print "\n" + "="*60
+            print "\n" + BANNER
             print "FLIGHT COMPLETE"
-            print "="*60
+            print BANNER
             print "Flight duration: %.1f seconds" % flight_duration
             print "Max altitude reached: %.3f meters" % max_altitude
             print "Target altitude: %.3f meters" % target_altitude
-            print "="*60
+            print BANNER
 
     except KeyboardInterrupt:
         print "\n\nEMERGENCY STOP ACTIVATED!"
         if master:
             # Immediate shutdown
-            rc_channels = [NEUTRAL, NEUTRAL, THROTTLE_MIN, NEUTRAL, 0, 0, 0, 0]
-            set_rc_override(master, rc_channels)
-            time.sleep(0.5)
-            release_rc_override(master)
             try:
-                disarm_throttle(master)
+                emergency_disarm(master)
             except:
                 pass
 
@@ -5,7 +5,14 @@
 from dronekit import connect
 from pymavlink import mavutil
 import time
-import math
+from mavlink_helpers import set_message_interval
+
+
+# Stationary means total acceleration within 0.5 m/s^2 of gravity;
+# bounds are squared so no sqrt is needed per sample
+STATIONARY_ACCEL_MIN_SQ = (9.8 - 0.5) ** 2
+STATIONARY_ACCEL_MAX_SQ = (9.8 + 0.5) ** 2
+STATIONARY_READINGS_MASK = 0x07  # last 3 readings
 
 
 class AltitudeFilter:
@@ -15,17 +22,15 @@ class AltitudeFilter:
         self.altitude = 0.0
         self.velocity = 0.0
         self.last_update = None
-        self.stationary_count = 0
+        self.stationary_mask = 0  # bit i set = stationary i readings ago
         self.home_altitude = None
         self.last_raw_alt = None
 
     def is_stationary(self, accel_x, accel_y, accel_z):
         """Check if drone is stationary based on accelerometer"""
-        total_accel = math.sqrt(accel_x**2 + accel_y**2 + accel_z**2)
+        total_accel_sq = accel_x * accel_x + accel_y * accel_y + accel_z * accel_z
         # Should be ~9.8 m/s^2 if stationary (just gravity)
-        if abs(total_accel - 9.8) < 0.5:
-            return True
-        return False
+        return STATIONARY_ACCEL_MIN_SQ < total_accel_sq < STATIONARY_ACCEL_MAX_SQ
 
     def update(self, raw_altitude, accel_x, accel_y, accel_z):
         """Update filtered altitude estimate"""
@@ -48,13 +53,10 @@ class AltitudeFilter:
         # Check if stationary
         stationary = self.is_stationary(accel_x, accel_y, accel_z)
 
-        if stationary:
-            self.stationary_count += 1
-        else:
-            self.stationary_count = 0
+        self.stationary_mask = ((self.stationary_mask << 1) | stationary) & 0xFF
 
         # If stationary for 3+ readings, reset drift
-        if self.stationary_count >= 3:
+        if self.stationary_mask & STATIONARY_READINGS_MASK == STATIONARY_READINGS_MASK:
             self.altitude = self.altitude * 0.95 + relative_alt * 0.05
             self.velocity = 0.0
         else:
@@ -96,6 +98,15 @@ def get_imu_data(master):
     return 0.0, 0.0, 9.8  # Default to stationary
 
 
+# Messages behind the printed attributes: battery, GPS fix and EKF (is_armable)
+INFO_MESSAGE_IDS = (
+    mavutil.mavlink.MAVLINK_MSG_ID_SYS_STATUS,
+    mavutil.mavlink.MAVLINK_MSG_ID_GPS_RAW_INT,
+    mavutil.mavlink.MAVLINK_MSG_ID_EKF_STATUS_REPORT,
+)
+INFO_MESSAGE_INTERVAL_US = 100000  # 10 Hz
+
+
 print "Connecting directly to flight controller on /dev/ttyS1..."
 
 try:
@@ -107,6 +118,11 @@ try:
 
     print "Connected! Fetching data..."
 
+    # Stream the messages we print at 10 Hz so each arrives within the wait
+    # below, instead of depending on the default stream rates
+    for message_id in INFO_MESSAGE_IDS:
+        set_message_interval(vehicle._master, message_id, INFO_MESSAGE_INTERVAL_US)
+
     # Only wait for heartbeat, nothing else
     time.sleep(1)
 
@@ -14,6 +14,11 @@ import tty
 import termios
 import time
 import select
+from mavlink_helpers import (emergency_disarm, recv_latest, release_rc_override,
+                             set_message_interval, wait_disarmed)
+
+# Separator line for the status banners
+BANNER = "=" * 60
 
 
 def set_rc_override(master, channels):
@@ -26,15 +31,6 @@ def set_rc_override(master, channels):
     )
 
 
-def release_rc_override(master):
-    """Release RC override"""
-    master.mav.rc_channels_override_send(
-        master.target_system,
-        master.target_component,
-        0, 0, 0, 0, 0, 0, 0, 0
-    )
-
-
 def arm_throttle(master):
     """Arm the drone throttle"""
     print "Arming throttle..."
@@ -47,8 +43,7 @@ def disarm_throttle(master):
     """Disarm the drone throttle"""
     print "Disarming throttle..."
     master.arducopter_disarm()
-    master.motors_disarmed_wait()
-    print "DISARMED"
+    wait_disarmed(master)
 
 
 def set_mode(master, mode):
@@ -69,13 +64,22 @@ def set_mode(master, mode):
         mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED,
         mode_id
     )
-    print "Mode set to %s" % mode
+
+    # Wait for a HEARTBEAT confirming the new mode instead of a fixed delay
+    deadline = time.time() + 3
+    while time.time() < deadline:
+        heartbeat = master.recv_match(type='HEARTBEAT', blocking=True,
+                                      timeout=deadline - time.time())
+        if heartbeat and master.flightmode == mode:
+            print "Mode set to %s" % mode
+            return
+    print "WARNING: Mode change to %s not confirmed" % mode
 
 
 def get_velocity(master):
-    """Get horizontal velocity from LOCAL_POSITION_NED"""
+    """Get horizontal velocity from the newest queued LOCAL_POSITION_NED"""
     try:
-        msg = master.recv_match(type='LOCAL_POSITION_NED', blocking=False, timeout=0.01)
+        msg = recv_latest(master, 'LOCAL_POSITION_NED')
         if msg:
             return msg.vx, msg.vy  # vx = forward/back, vy = left/right
     except:
@@ -109,9 +113,9 @@ def interactive_throttle():
     KP_PITCH = 40  # PWM correction per m/s for forward/back drift
     MAX_CORRECTION = 200  # Maximum PWM correction limit
 
-    print "="*60
+    print BANNER
     print "INTERACTIVE THROTTLE WITH DRIFT CORRECTION - INTEL AERO"
-    print "="*60
+    print BANNER
     print ""
     print "Drift Correction: ENABLED (Kp_roll=%d, Kp_pitch=%d)" % (KP_ROLL, KP_PITCH)
     print "WARNING: Ensure drone is secured!"
@@ -127,11 +131,15 @@ def interactive_throttle():
         master = mavutil.mavlink_connection('/dev/ttyS1', baud=1500000)
         master.wait_heartbeat()
         print "Connected! System %u Component %u" % (master.target_system, master.target_component)
+
+        # Stream velocity at 50 Hz for drift correction instead of the default rate
+        set_message_interval(master,
+                             mavutil.mavlink.MAVLINK_MSG_ID_LOCAL_POSITION_NED,
+                             20000)
         time.sleep(1)
 
         # Set mode to STABILIZED
         set_mode(master, 'STABILIZED')
-        time.sleep(1)
 
         # Arm throttle
         arm_throttle(master)
@@ -144,14 +152,14 @@ def interactive_throttle():
         time.sleep(0.5)
 
         # Interactive control
-        print "\n" + "="*60
+        print "\n" + BANNER
         print "CONTROLS:"
         print "  UP Arrow   = Increase throttle by 0.5%%"
         print "  DOWN Arrow = Decrease throttle by 0.5%%"
         print "  x          = Stop motors and exit"
         print ""
         print "DRIFT CORRECTION: Active (using velocity feedback)"
-        print "="*60
+        print BANNER
         print ""
         print "Current Throttle: %d%% (PWM: %d)" % (current_percent, current_pwm)
         print ""
@@ -266,16 +274,15 @@ def interactive_throttle():
         # Disarm
         disarm_throttle(master)
 
-        print "\n" + "="*60
+        print "\n" + BANNER
         print "SESSION COMPLETE"
         print "Final throttle tested: %d%% (PWM: %d)" % (current_percent, current_pwm)
-        print "="*60
+        print BANNER
 
     except KeyboardInterrupt:
         print "\n\nEMERGENCY STOP!"
         if master:
-            release_rc_override(master)
-            disarm_throttle(master)
+            emergency_disarm(master)
 
     except Exception as e:
         print "\nERROR: %s" % str(e)
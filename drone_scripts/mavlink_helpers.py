@@ -0,0 +1,70 @@
+#!/usr/bin/env python2.7
+# -*- coding: utf-8 -*-
+
+"""
+MAVLink Helpers - Intel Aero RTF Drone
+Shared pymavlink helpers for the drone scripts
+"""
+
+from pymavlink import mavutil
+import time
+
+
+def release_rc_override(master):
+    """Release RC override"""
+    master.mav.rc_channels_override_send(
+        master.target_system,
+        master.target_component,
+        0, 0, 0, 0, 0, 0, 0, 0
+    )
+
+
+def emergency_disarm(master):
+    """Stop the motors immediately - forced disarm is accepted even in flight"""
+    print "Force disarming..."
+    master.mav.command_long_send(
+        master.target_system,
+        master.target_component,
+        mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM,
+        0,
+        0,      # disarm
+        21196,  # force, skip the landed check
+        0, 0, 0, 0, 0
+    )
+    release_rc_override(master)
+    wait_disarmed(master)
+
+
+def wait_disarmed(master, timeout=3.0):
+    """Wait for a HEARTBEAT reporting disarmed, giving up after timeout seconds"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        heartbeat = master.recv_match(type='HEARTBEAT', blocking=True, timeout=0.2)
+        if heartbeat and not master.motors_armed():
+            print "DISARMED"
+            return True
+    print "WARNING: Disarm not confirmed"
+    return False
+
+
+def set_message_interval(master, message_id, interval_us):
+    """Ask the flight controller to stream a message every interval_us microseconds"""
+    master.mav.command_long_send(
+        master.target_system,
+        master.target_component,
+        mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL,
+        0,
+        message_id,
+        interval_us,
+        0, 0, 0, 0, 0
+    )
+
+
+def recv_latest(master, msg_type):
+    """Drain queued messages of msg_type and return the newest (None if none queued)"""
+    latest = None
+    while True:
+        msg = master.recv_match(type=msg_type, blocking=False)
+        if msg is None:
+            return latest
+        latest = msg
@@ -4,6 +4,7 @@ Raw MAVLink message dump - see what messages the FC is actually sending
 """
 
 from pymavlink import mavutil
+from collections import Counter
 import time
 
 print "=" * 50
@@ -15,30 +16,34 @@ master = mavutil.mavlink_connection('/dev/ttyS1', baud=1500000)
 master.wait_heartbeat()
 print "Connected! System %u Component %u" % (master.target_system, master.target_component)
 
+# Fields worth printing when a message type is first seen
+INTERESTING_FIELDS = ('alt', 'relative_alt', 'z', 'press_abs', 'xacc', 'yacc', 'zacc')
+
 # Track what messages we receive
-message_counts = {}
+message_counts = Counter()
 
 print ""
 print "Monitoring messages for 10 seconds..."
 print ""
 
-start_time = time.time()
-while (time.time() - start_time) < 10:
-    msg = master.recv_match(blocking=False)
+deadline = time.time() + 10
+while True:
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        break
+    # Sleep in the read until a message arrives (no busy polling)
+    msg = master.recv_match(blocking=True, timeout=min(0.5, remaining))
     if msg:
         msg_type = msg.get_type()
-        if msg_type not in message_counts:
-            message_counts[msg_type] = 0
+        count = message_counts[msg_type] + 1
+        message_counts[msg_type] = count
+        if count == 1:
             # Print first occurrence of each message type
             print "NEW: %s" % msg_type
-            if hasattr(msg, 'to_dict'):
-                d = msg.to_dict()
-                # Print interesting fields
-                for key in ['alt', 'relative_alt', 'z', 'press_abs', 'xacc', 'yacc', 'zacc']:
-                    if key in d:
-                        print "  %s = %s" % (key, d[key])
-        message_counts[msg_type] += 1
-    time.sleep(0.001)
+            for key in INTERESTING_FIELDS:
+                value = getattr(msg, key, None)
+                if value is not None:
+                    print "  %s = %s" % (key, value)
 
 print ""
 print "=" * 50
@@ -8,11 +8,13 @@ import time
 print "=== Intel Aero Camera - Video Recording ==="
 
 # Use GStreamer pipeline for Intel RealSense camera
+# appsink keeps only the newest frame: if writing falls behind, old frames
+# are dropped instead of queueing up in memory
 gst_pipeline = (
     "v4l2src device=/dev/video13 ! "
     "video/x-raw,width=640,height=480,framerate=30/1 ! "
-    "videoconvert ! "
-    "appsink"
+    "videoconvert ! video/x-raw,format=BGR ! "
+    "appsink max-buffers=1 drop=true sync=false"
 )
 
 print "Opening camera..."
@@ -41,13 +43,28 @@ print "Resolution: %dx%d" % (width, height)
 # Record video
 print "\nRecording 10 second video..."
 
-# Use fixed filename
-filename = "/home/root/test_vid.avi"
-
-# Use MJPG codec which is more compatible
-fourcc = cv2.VideoWriter_fourcc(*'MJPG')
+# Prefer H.264 on the Atom's hardware encoder (VAAPI): no CPU encoding
+# and much smaller files than MJPG
+filename = "/home/root/test_vid.mp4"
+h264_pipeline = (
+    "appsrc ! videoconvert ! "
+    "vaapih264enc rate-control=cbr bitrate=4000 ! "
+    "h264parse ! mp4mux ! "
+    "filesink location=%s" % filename
+)
 # Match the recording fps to capture fps (30)
-out = cv2.VideoWriter(filename, fourcc, 30.0, (width, height))
+try:
+    out = cv2.VideoWriter(h264_pipeline, cv2.CAP_GSTREAMER, 0, 30.0, (width, height))
+except (TypeError, AttributeError, cv2.error):
+    # Older OpenCV builds have no apiPreference constructor (or CAP_GSTREAMER)
+    out = None
+
+if out is None or not out.isOpened():
+    # No VAAPI encoder available: fall back to software MJPG
+    print "WARNING: Hardware H.264 encoder unavailable, using MJPG"
+    filename = "/home/root/test_vid.avi"
+    fourcc = cv2.VideoWriter_fourcc(*'MJPG')
+    out = cv2.VideoWriter(filename, fourcc, 30.0, (width, height))
 
 if not out.isOpened():
     print "ERROR: Failed to open video writer"
@@ -67,7 +84,8 @@ print "Recording started..."
 
 try:
     while (time.time() - start_time) < duration:
-        ret, frame = camera.read()
+        # Decode into the same array every time instead of allocating a new one
+        ret, frame = camera.read(frame)
         if ret:
             # Verify frame has correct dimensions
             if frame.shape[0] == height and frame.shape[1] == width:
@@ -87,7 +105,6 @@ finally:
     print "\nReleasing camera and video writer..."
     camera.release()
     out.release()
-    cv2.destroyAllWindows()
     
     actual_duration = time.time() - start_time
     
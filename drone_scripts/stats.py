@@ -31,24 +31,29 @@ UPDATE_INTERVAL = 1.0
 
 def get_vehicle_status(vehicle):
     """Build status dictionary from vehicle state"""
+    # Each DroneKit attribute read builds a new object, so read each once
+    mode = vehicle.mode
+    gps = vehicle.gps_0
+    frame = vehicle.location.global_frame
+    attitude = vehicle.attitude
     return {
         "connected_status": vehicle.is_armable is not None,
         "drone_id": DRONE_ID,
-        "mode": vehicle.mode.name if vehicle.mode else "UNKNOWN",
+        "mode": mode.name if mode else "UNKNOWN",
         "armed": vehicle.armed,
         "gps": {
-            "fix_type": vehicle.gps_0.fix_type if vehicle.gps_0 else 0,
-            "satellites": vehicle.gps_0.satellites_visible if vehicle.gps_0 else 0
+            "fix_type": gps.fix_type if gps else 0,
+            "satellites": gps.satellites_visible if gps else 0
         },
         "location": {
-            "lat": vehicle.location.global_frame.lat if vehicle.location.global_frame else None,
-            "lon": vehicle.location.global_frame.lon if vehicle.location.global_frame else None,
-            "alt": vehicle.location.global_frame.alt if vehicle.location.global_frame else None
+            "lat": frame.lat if frame else None,
+            "lon": frame.lon if frame else None,
+            "alt": frame.alt if frame else None
         },
         "attitude": {
-            "roll": vehicle.attitude.roll if vehicle.attitude else 0,
-            "pitch": vehicle.attitude.pitch if vehicle.attitude else 0,
-            "yaw": vehicle.attitude.yaw if vehicle.attitude else 0
+            "roll": attitude.roll if attitude else 0,
+            "pitch": attitude.pitch if attitude else 0,
+            "yaw": attitude.yaw if attitude else 0
         },
         "groundspeed": vehicle.groundspeed or 0,
         "airspeed": vehicle.airspeed or 0,
@@ -68,7 +73,9 @@ def main():
         print(json.dumps({"status": "connecting", "drone_id": DRONE_ID}))
         sys.stdout.flush()
 
-        vehicle = connect(CONNECTION_STRING, wait_ready=True)
+        # Only wait for the state we report first; skipping the full
+        # parameter download cuts connect time from ~15 s to a second or two
+        vehicle = connect(CONNECTION_STRING, wait_ready=['mode', 'armed', 'attitude'])
 
         print(json.dumps({"status": "connected", "drone_id": DRONE_ID}))
         sys.stdout.flush()
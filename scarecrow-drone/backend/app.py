@@ -1,13 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from controllers.drone_controller import drone_router
 from controllers.flight_controller import flight_router
 from controllers.connection_controller import connection_router
-from services.drone_connection import DroneConnection
+from services.drone_connection import DRONE_CONN
 from services.connection_service import ConnectionService
+from database.db_connection import DatabaseConnection
 
-app = FastAPI(title="Scarecrow Drone API")
-drone_connection = DroneConnection()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Write pending telemetry, then close the database; aiosqlite's worker
+    # thread is not a daemon and would keep the process alive
+    await DRONE_CONN.shutdown()
+    await DatabaseConnection().disconnect()
+
+
+app = FastAPI(title="Scarecrow Drone API", lifespan=lifespan)
+drone_connection = DRONE_CONN
 connection_service = ConnectionService()
 
 # Wire up ConnectionService to DroneConnection for SSH data updates
@@ -47,7 +59,11 @@ async def websocket_drone(websocket: WebSocket):
 
 @app.websocket("/ws/frontend")
 async def websocket_frontend(websocket: WebSocket):
-    """WebSocket endpoint for frontend to receive real-time updates"""
+    """WebSocket endpoint for frontend to receive real-time updates
+
+    Updates are UTF-8 JSON sent as binary frames; clients should decode
+    and JSON.parse them (set binaryType = "arraybuffer" in the browser).
+    """
     await drone_connection.connect_frontend(websocket)
     try:
         while True:
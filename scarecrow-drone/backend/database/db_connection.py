@@ -1,10 +1,12 @@
-import sqlite3
+import asyncio
 import os
 from typing import Optional, List, Any
 
+import aiosqlite
+
 
 class DatabaseConnection:
-    """SQLite database connection manager"""
+    """SQLite database connection manager (async, runs queries off the event loop)"""
 
     _instance: Optional['DatabaseConnection'] = None
 
@@ -15,6 +17,9 @@ class DatabaseConnection:
         'scarecrow.db'
     )
 
+    # Table and index definitions (shared with database/database.py)
+    SCHEMA_PATH = os.path.join(os.path.dirname(DB_PATH), 'schema.sql')
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -25,45 +30,57 @@ class DatabaseConnection:
         if self._initialized:
             return
         self._initialized = True
-        self.connection: Optional[sqlite3.Connection] = None
+        self.connection: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
 
-    def connect(self) -> sqlite3.Connection:
+    async def connect(self) -> aiosqlite.Connection:
         """Establish database connection"""
         if self.connection is None:
-            self.connection = sqlite3.connect(self.DB_PATH, check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row
+            async with self._connect_lock:
+                if self.connection is None:
+                    conn = await aiosqlite.connect(self.DB_PATH)
+                    conn.row_factory = aiosqlite.Row
+                    try:
+                        await self._configure(conn)
+                    except Exception:
+                        # Stop aiosqlite's worker thread, or the process cannot exit
+                        await conn.close()
+                        raise
+                    self.connection = conn
         return self.connection
 
-    def disconnect(self):
+    async def _configure(self, conn: aiosqlite.Connection):
+        """Apply connection PRAGMAs and make sure tables and indexes exist"""
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        await conn.execute("PRAGMA mmap_size=134217728")
+        with open(self.SCHEMA_PATH) as f:
+            await conn.executescript(f.read())
+        await conn.execute("PRAGMA optimize")
+        await conn.commit()
+
+    async def disconnect(self):
         """Close database connection"""
         if self.connection:
-            self.connection.close()
+            await self.connection.close()
             self.connection = None
 
-    def execute_query(self, query: str, params: tuple = None) -> List[sqlite3.Row]:
+    async def execute_query(self, query: str, params: tuple = None) -> List[aiosqlite.Row]:
         """Execute a SELECT query and return results"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        return cursor.fetchall()
+        conn = await self.connect()
+        async with conn.execute(query, params or ()) as cursor:
+            return await cursor.fetchall()
 
-    def execute_write(self, query: str, params: tuple = None) -> int:
+    async def execute_write(self, query: str, params: tuple = None) -> int:
         """Execute an INSERT/UPDATE/DELETE query and return last row id"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        conn.commit()
+        conn = await self.connect()
+        cursor = await conn.execute(query, params or ())
+        await conn.commit()
         return cursor.lastrowid
 
-    def execute_many(self, query: str, params_list: List[tuple]) -> None:
+    async def execute_many(self, query: str, params_list: List[tuple]) -> None:
         """Execute a query with multiple parameter sets"""
-        conn = self.connect()
-        cursor = conn.cursor()
-        cursor.executemany(query, params_list)
-        conn.commit()
+        conn = await self.connect()
+        await conn.executemany(query, params_list)
+        await conn.commit()
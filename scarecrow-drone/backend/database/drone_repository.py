@@ -1,3 +1,4 @@
+import json
 from database.db_connection import DatabaseConnection
 from database.flight_repository import FlightRepository
 
@@ -16,45 +17,83 @@ class DroneRepository:
         """Get current in-progress flight ID"""
         return DroneRepository._current_flight_id
 
-    def start_flight(self) -> int:
+    async def start_flight(self) -> int:
         """Create a new flight record and return the flight_id"""
-        flight_id = self.flight_repository.create_flight()
+        flight_id = await self.flight_repository.create_flight()
         DroneRepository._current_flight_id = flight_id
         return flight_id
 
-    def end_flight(self, status: str = 'completed') -> bool:
+    async def end_flight(self, status: str = 'completed') -> bool:
         """End the current flight"""
         if DroneRepository._current_flight_id is None:
             return False
 
-        self.flight_repository.end_flight(DroneRepository._current_flight_id, status)
+        await self.flight_repository.end_flight(DroneRepository._current_flight_id, status)
         DroneRepository._current_flight_id = None
         return True
 
-    def save_telemetry(self, flight_id: int, telemetry_data: dict) -> bool:
+    async def save_telemetry(self, flight_id: int, telemetry_data: dict) -> bool:
         """Save telemetry data for a flight"""
         query = """
             INSERT INTO telemetry
             (flight_id, timestamp, mode, armed, location, attitude, groundspeed)
             VALUES (?, datetime('now'), ?, ?, ?, ?, ?)
         """
-        import json
-        self.db.execute_write(query, (
-            flight_id,
+        await self.db.execute_write(query, (flight_id,) + self._telemetry_values(telemetry_data))
+        return True
+
+    async def insert_telemetry_batch(self, rows: list) -> int:
+        """
+        Save buffered telemetry in a single transaction
+        rows: list of (flight_id, timestamp, telemetry_data) tuples
+        """
+        if not rows:
+            return 0
+        query = """
+            INSERT INTO telemetry
+            (flight_id, timestamp, mode, armed, location, attitude, groundspeed)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        await self.db.execute_many(query, [
+            (flight_id, timestamp) + self._telemetry_values(telemetry_data)
+            for flight_id, timestamp, telemetry_data in rows
+        ])
+        return len(rows)
+
+    def _telemetry_values(self, telemetry_data: dict) -> tuple:
+        """Convert a drone telemetry dict to (mode, armed, location, attitude, groundspeed)"""
+        return (
             telemetry_data.get('mode', 'MANUAL'),
             1 if telemetry_data.get('armed') else 0,
             json.dumps(telemetry_data.get('location', {})),
             json.dumps(telemetry_data.get('attitude', {})),
             telemetry_data.get('groundspeed', 0)
-        ))
-        return True
+        )
 
-    def get_flight_telemetry(self, flight_id: int) -> list:
+    async def get_flight_telemetry(self, flight_id: int) -> list:
         """Get all telemetry data for a flight"""
         query = """
             SELECT * FROM telemetry
             WHERE flight_id = ?
             ORDER BY timestamp ASC
         """
-        rows = self.db.execute_query(query, (flight_id,))
+        rows = await self.db.execute_query(query, (flight_id,))
         return [dict(row) for row in rows]
+
+    async def get_flight_aggregates(self, flight_id: int) -> dict:
+        """Get average groundspeed and altitude for a flight (missing values count as 0)"""
+        query = """
+            SELECT
+                AVG(COALESCE(groundspeed, 0)) AS avg_speed,
+                AVG(COALESCE(
+                    CASE WHEN json_valid(location) THEN json_extract(location, '$.alt') END,
+                    0
+                )) AS avg_altitude
+            FROM telemetry
+            WHERE flight_id = ?
+        """
+        row = (await self.db.execute_query(query, (flight_id,)))[0]
+        return {
+            "avg_speed": row['avg_speed'] or 0.0,
+            "avg_altitude": row['avg_altitude'] or 0.0
+        }
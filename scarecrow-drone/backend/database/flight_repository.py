@@ -9,39 +9,39 @@ class FlightRepository:
     def __init__(self):
         self.db = DatabaseConnection()
 
-    def get_all_flights(self) -> List[dict]:
+    async def get_all_flights(self) -> List[dict]:
         """Get all flights from database ordered by start_time descending"""
         query = """
             SELECT flight_id, start_time, end_time, status, notes
             FROM flights
             ORDER BY start_time DESC
         """
-        rows = self.db.execute_query(query)
+        rows = await self.db.execute_query(query)
         return [self._row_to_dict(row) for row in rows]
 
-    def get_flight_by_id(self, flight_id: str) -> Optional[dict]:
+    async def get_flight_by_id(self, flight_id: str) -> Optional[dict]:
         """Get a single flight by ID"""
         query = """
             SELECT flight_id, start_time, end_time, status, notes
             FROM flights
             WHERE flight_id = ?
         """
-        rows = self.db.execute_query(query, (flight_id,))
+        rows = await self.db.execute_query(query, (flight_id,))
         if rows:
             return self._row_to_dict(rows[0])
         return None
 
-    def create_flight(self) -> int:
+    async def create_flight(self) -> int:
         """Create a new flight record and return the flight_id"""
         query = """
             INSERT INTO flights (start_time, status)
             VALUES (?, 'in_progress')
         """
         start_time = datetime.now().isoformat()
-        flight_id = self.db.execute_write(query, (start_time,))
+        flight_id = await self.db.execute_write(query, (start_time,))
         return flight_id
 
-    def end_flight(self, flight_id: int, status: str = 'completed') -> bool:
+    async def end_flight(self, flight_id: int, status: str = 'completed') -> bool:
         """End a flight by setting end_time and status"""
         query = """
             UPDATE flights
@@ -49,27 +49,27 @@ class FlightRepository:
             WHERE flight_id = ?
         """
         end_time = datetime.now().isoformat()
-        self.db.execute_write(query, (end_time, status, flight_id))
+        await self.db.execute_write(query, (end_time, status, flight_id))
         return True
 
-    def update_flight(self, flight_id: int, flight_data: dict) -> bool:
+    async def update_flight(self, flight_id: int, flight_data: dict) -> bool:
         """Update an existing flight record"""
         query = """
             UPDATE flights
             SET status = ?, notes = ?
             WHERE flight_id = ?
         """
-        self.db.execute_write(query, (
+        await self.db.execute_write(query, (
             flight_data.get('status'),
             flight_data.get('notes'),
             flight_id
         ))
         return True
 
-    def delete_flight(self, flight_id: int) -> bool:
+    async def delete_flight(self, flight_id: int) -> bool:
         """Delete a flight record"""
         query = "DELETE FROM flights WHERE flight_id = ?"
-        self.db.execute_write(query, (flight_id,))
+        await self.db.execute_write(query, (flight_id,))
         return True
 
     def _row_to_dict(self, row) -> dict:
@@ -2,105 +2,270 @@
 Drone Connection Module
 Handles WebSocket communication with drone scripts running on Intel Aero
 """
+import asyncio
 import json
-from typing import Set
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+import orjson
 from fastapi import WebSocket
+from database.drone_repository import DroneRepository
 
 
 class DroneConnection:
     """Manages WebSocket connection with drone"""
 
-    _instance = None
-
-    # Connected WebSocket clients (drone + frontend listeners)
-    _drone_websocket: WebSocket = None
-    _frontend_websockets: Set[WebSocket] = set()
-
-    # Current drone status
-    _status = {
-        "is_connected": False,
-        "is_flying": False,
-        "mode": "MANUAL",
-        "armed": False,
-        "location": {},
-        "attitude": {},
-        "groundspeed": 0.0
-    }
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+    __slots__ = (
+        "_drone_repository",
+        "_drone_websocket",
+        "_frontend_websockets",
+        "_frontend_writers",
+        "_frontend_queues",
+        "_status",
+        "_status_bytes",
+        "_status_lock",
+        "_telemetry_buffer",
+        "_last_telemetry_time",
+        "_flush_task",
+        "_status_dirty",
+        "_status_task",
+    )
+
+    # Seconds between telemetry writes to the database (batched)
+    TELEMETRY_FLUSH_INTERVAL = 2.0
+
+    # Minimum seconds between recorded telemetry rows (drone updates arrive faster)
+    TELEMETRY_RECORD_INTERVAL = 1.0
+
+    # Maximum status broadcasts per second; faster drone updates are merged
+    STATUS_BROADCAST_HZ = 5.0
+
+    # Pending messages per frontend; the oldest is dropped when full
+    FRONTEND_QUEUE_SIZE = 32
+
+    # Event messages, encoded once
+    _DRONE_CONNECTED = orjson.dumps({"event": "drone_connected"})
+    _DRONE_DISCONNECTED = orjson.dumps({"event": "drone_disconnected"})
 
     def __init__(self):
-        if self._initialized:
-            return
-        self._initialized = True
+        self._drone_repository = DroneRepository()
+
+        # Connected WebSocket clients (drone + frontend listeners)
+        self._drone_websocket: Optional[WebSocket] = None
+        self._frontend_websockets: Dict[WebSocket, asyncio.Queue] = {}
+        self._frontend_writers: Dict[WebSocket, asyncio.Task] = {}
+        # Queues to broadcast to; replaced (never mutated) when frontends change
+        self._frontend_queues: Tuple[asyncio.Queue, ...] = ()
+
+        # Current drone status
+        self._status = {
+            "is_connected": False,
+            "is_flying": False,
+            "mode": "MANUAL",
+            "armed": False,
+            "location": {},
+            "attitude": {},
+            "groundspeed": 0.0
+        }
+        # Encoded _status, rebuilt on demand after a change
+        self._status_bytes: Optional[bytes] = None
+        # Guards encoding against updates from the SSH reader thread
+        self._status_lock = threading.Lock()
+
+        # Telemetry waiting to be written: (flight_id, timestamp, status snapshot)
+        self._telemetry_buffer = deque()
+        self._last_telemetry_time = float("-inf")
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # Set when _status changed since the last broadcast
+        self._status_dirty: Optional[asyncio.Event] = None
+        self._status_task: Optional[asyncio.Task] = None
 
     async def connect_drone(self, websocket: WebSocket) -> None:
         """Connect drone WebSocket"""
         await websocket.accept()
-        DroneConnection._drone_websocket = websocket
-        DroneConnection._status["is_connected"] = True
-        await self._broadcast_to_frontends({"event": "drone_connected"})
+        self._drone_websocket = websocket
+        self._status["is_connected"] = True
+        self._status_bytes = None
+        self._broadcast_to_frontends(self._DRONE_CONNECTED)
 
     async def disconnect_drone(self) -> None:
         """Disconnect drone WebSocket"""
-        DroneConnection._drone_websocket = None
-        DroneConnection._status["is_connected"] = False
-        DroneConnection._status["is_flying"] = False
-        await self._broadcast_to_frontends({"event": "drone_disconnected"})
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._flush_telemetry()
+        if self._status_task:
+            self._status_task.cancel()
+            self._status_task = None
+            # Deliver the last update before announcing the disconnect
+            if self._status_dirty.is_set():
+                self._broadcast_to_frontends(self.get_status_bytes())
+        self._drone_websocket = None
+        self._status["is_connected"] = False
+        self._status["is_flying"] = False
+        self._status_bytes = None
+        self._broadcast_to_frontends(self._DRONE_DISCONNECTED)
+
+    async def shutdown(self) -> None:
+        """Stop background tasks and write pending telemetry (called on app shutdown)"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._status_task:
+            self._status_task.cancel()
+            self._status_task = None
+        for writer in self._frontend_writers.values():
+            writer.cancel()
+        self._frontend_writers.clear()
+        await self._flush_telemetry()
 
     async def connect_frontend(self, websocket: WebSocket) -> None:
         """Connect frontend WebSocket listener"""
         await websocket.accept()
-        DroneConnection._frontend_websockets.add(websocket)
+        queue = asyncio.Queue(maxsize=self.FRONTEND_QUEUE_SIZE)
         # Send current status on connect
-        await websocket.send_json(DroneConnection._status)
+        queue.put_nowait(self.get_status_bytes())
+        self._frontend_websockets[websocket] = queue
+        self._frontend_queues = self._frontend_queues + (queue,)
+        self._frontend_writers[websocket] = asyncio.create_task(
+            self._frontend_writer(websocket, queue)
+        )
 
     def disconnect_frontend(self, websocket: WebSocket) -> None:
         """Disconnect frontend WebSocket listener"""
-        DroneConnection._frontend_websockets.discard(websocket)
+        self._remove_frontend(websocket)
+        writer = self._frontend_writers.pop(websocket, None)
+        if writer:
+            writer.cancel()
+
+    def _remove_frontend(self, websocket: WebSocket) -> None:
+        """Unregister a frontend and publish the remaining broadcast queues"""
+        queue = self._frontend_websockets.pop(websocket, None)
+        if queue is not None:
+            self._frontend_queues = tuple(
+                q for q in self._frontend_queues if q is not queue
+            )
+
+    async def _frontend_writer(self, websocket: WebSocket, queue: asyncio.Queue) -> None:
+        """Send queued messages to one frontend, so a slow client only delays itself"""
+        try:
+            while True:
+                message = await queue.get()
+                await websocket.send_bytes(message)
+        except Exception:
+            # Send failed - client is gone
+            self._remove_frontend(websocket)
+            self._frontend_writers.pop(websocket, None)
 
     async def receive_drone_data(self, data: dict) -> None:
         """Process incoming data from drone and broadcast to frontends"""
-        DroneConnection._status.update(data)
-        DroneConnection._status["is_connected"] = True
-        await self._broadcast_to_frontends(DroneConnection._status)
+        self._status.update(data)
+        self._status["is_connected"] = True
+        self._status_bytes = None
+        self._buffer_telemetry()
+        if not self._frontend_queues:
+            # Nobody listening; new frontends get the current status on connect
+            return
+        if self._status_task is None:
+            self._status_dirty = asyncio.Event()
+            self._status_task = asyncio.create_task(self._status_broadcast_loop())
+        self._status_dirty.set()
+
+    async def _status_broadcast_loop(self) -> None:
+        """Broadcast the latest status, at most STATUS_BROADCAST_HZ times per second"""
+        dirty = self._status_dirty
+        while True:
+            await dirty.wait()
+            dirty.clear()
+            self._broadcast_to_frontends(self.get_status_bytes())
+            await asyncio.sleep(1 / self.STATUS_BROADCAST_HZ)
+
+    def _buffer_telemetry(self) -> None:
+        """Queue current status for the in-progress flight (written in batches)"""
+        flight_id = self._drone_repository.get_current_flight_id()
+        if flight_id is None:
+            return
+        now = time.monotonic()
+        if now - self._last_telemetry_time < self.TELEMETRY_RECORD_INTERVAL:
+            return
+        self._last_telemetry_time = now
+        self._telemetry_buffer.append(
+            (flight_id, datetime.now().isoformat(), dict(self._status))
+        )
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_telemetry_loop())
+
+    async def _flush_telemetry_loop(self) -> None:
+        """Periodically write buffered telemetry in one transaction"""
+        while True:
+            await asyncio.sleep(self.TELEMETRY_FLUSH_INTERVAL)
+            await self._flush_telemetry()
+
+    async def flush_telemetry(self) -> None:
+        """Write buffered telemetry now (call before ending a flight)"""
+        await self._flush_telemetry()
+
+    async def _flush_telemetry(self) -> None:
+        """Write all buffered telemetry to the database"""
+        if not self._telemetry_buffer:
+            return
+        rows = list(self._telemetry_buffer)
+        self._telemetry_buffer.clear()
+        try:
+            await self._drone_repository.insert_telemetry_batch(rows)
+        except Exception as e:
+            print(f"[DroneConnection] Failed to save telemetry: {e}")
 
     async def send_command_to_drone(self, command: dict) -> bool:
         """Send command to drone via WebSocket"""
-        if DroneConnection._drone_websocket:
-            await DroneConnection._drone_websocket.send_json(command)
+        if self._drone_websocket:
+            await self._drone_websocket.send_text(orjson.dumps(command).decode())
             return True
         return False
 
-    async def _broadcast_to_frontends(self, data: dict) -> None:
-        """Broadcast data to all connected frontends"""
-        disconnected = set()
-        for websocket in DroneConnection._frontend_websockets:
-            try:
-                await websocket.send_json(data)
-            except:
-                disconnected.add(websocket)
-        # Clean up disconnected clients
-        DroneConnection._frontend_websockets -= disconnected
+    def _broadcast_to_frontends(self, message: bytes) -> None:
+        """Queue an encoded JSON message for all connected frontends (never waits on a client)"""
+        queues = self._frontend_queues
+        if not queues:
+            return
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
 
     def is_connected(self) -> bool:
         """Check if drone is connected"""
-        return DroneConnection._status.get("is_connected", False)
+        return self._status.get("is_connected", False)
 
     def is_flying(self) -> bool:
         """Check if drone is currently flying"""
-        return DroneConnection._status.get("is_flying", False)
+        return self._status.get("is_flying", False)
 
-    def get_status(self) -> dict:
-        """Get full drone status"""
-        return DroneConnection._status.copy()
+    def get_status(self) -> Mapping:
+        """Get full drone status (read-only view, no copy)"""
+        return MappingProxyType(self._status)
+
+    def get_status_bytes(self) -> bytes:
+        """Get full drone status as encoded JSON (cached until the status changes)"""
+        status_bytes = self._status_bytes
+        if status_bytes is None:
+            with self._status_lock:
+                status_bytes = orjson.dumps(self._status)
+                self._status_bytes = status_bytes
+        return status_bytes
 
     def update_status_from_ssh(self, data: dict) -> None:
-        """Update status from SSH subprocess (called by ConnectionService)"""
-        DroneConnection._status["is_connected"] = data.get("is_connected", False)
-        if "drone_id" in data:
-            DroneConnection._status["drone_id"] = data["drone_id"]
+        """Update status from SSH subprocess (called by ConnectionService's reader thread)"""
+        with self._status_lock:
+            self._status["is_connected"] = data.get("is_connected", False)
+            if "drone_id" in data:
+                self._status["drone_id"] = data["drone_id"]
+            self._status_bytes = None
+
+
+# Shared by the API endpoints and DroneService
+DRONE_CONN = DroneConnection()
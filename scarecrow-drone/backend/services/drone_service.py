@@ -1,12 +1,14 @@
-from services.drone_connection import DroneConnection
+from services.drone_connection import DRONE_CONN
 from services.connection_service import ConnectionService
 from services.detection_service import DetectionService
 from database.drone_repository import DroneRepository
 
 
 class DroneService:
+    __slots__ = ("drone_connection", "drone_repository", "connection_service", "detection_service")
+
     def __init__(self):
-        self.drone_connection = DroneConnection()
+        self.drone_connection = DRONE_CONN
         self.drone_repository = DroneRepository()
         self.connection_service = ConnectionService()
         self.detection_service = DetectionService()
@@ -39,7 +41,7 @@ class DroneService:
         #     }
 
         # Create flight record in database
-        flight_id = self.drone_repository.start_flight()
+        flight_id = await self.drone_repository.start_flight()
 
         # Start video stream from drone
         stream_result = self.connection_service.start_video_stream()
@@ -81,7 +83,8 @@ class DroneService:
             if detection_result.get("success"):
                 self.detection_service.stop_detection()
             
-            self.drone_repository.end_flight('failed')
+            await self.drone_connection.flush_telemetry()
+            await self.drone_repository.end_flight('failed')
             return {
                 "success": False,
                 "flightId": str(flight_id),
@@ -119,7 +122,8 @@ class DroneService:
 
         if result.get("success"):
             # End flight in database
-            self.drone_repository.end_flight('completed')
+            await self.drone_connection.flush_telemetry()
+            await self.drone_repository.end_flight('completed')
             return {
                 "success": True,
                 "pigeonsDetected": pigeon_count,
@@ -160,7 +164,8 @@ class DroneService:
         if result.get("success"):
             # End flight in database as aborted
             if flight_id is not None:
-                self.drone_repository.end_flight('aborted')
+                await self.drone_connection.flush_telemetry()
+                await self.drone_repository.end_flight('aborted')
             return {
                 "success": True,
                 "pigeonsDetected": pigeon_count,
@@ -1,5 +1,5 @@
 from typing import List, Optional
-import json
+import orjson
 from dto.flight_dto import FlightDTO
 from database.flight_repository import FlightRepository
 from database.drone_repository import DroneRepository
@@ -10,56 +10,37 @@ class FlightService:
         self.flight_repository = FlightRepository()
         self.drone_repository = DroneRepository()
 
-    def get_flight_history(self) -> List[dict]:
+    async def get_flight_history(self) -> List[dict]:
         """
         Get all flight history
         Returns: Array of { id, date, duration, pigeonsDetected, status, startTime, endTime }
         """
-        flights = self.flight_repository.get_all_flights()
+        flights = await self.flight_repository.get_all_flights()
         return [self._format_flight(flight) for flight in flights]
 
-    def get_flight(self, flight_id: str) -> Optional[dict]:
+    async def get_flight(self, flight_id: str) -> Optional[dict]:
         """
         Get a single flight by ID
         Returns: { id, date, duration, pigeonsDetected, status, startTime, endTime }
         """
-        flight = self.flight_repository.get_flight_by_id(flight_id)
+        flight = await self.flight_repository.get_flight_by_id(flight_id)
         if flight:
             return self._format_flight(flight)
         return None
 
-    def get_flight_summary(self, flight_id: str) -> Optional[dict]:
+    async def get_flight_summary(self, flight_id: str) -> Optional[dict]:
         """
         Get flight summary with stats calculated from telemetry
         Returns: { flightId, droneId, duration, avgSpeed, avgAltitude, status }
         """
-        flight = self.flight_repository.get_flight_by_id(flight_id)
+        flight = await self.flight_repository.get_flight_by_id(flight_id)
         if not flight:
             return None
 
-        telemetry = self.drone_repository.get_flight_telemetry(int(flight_id))
-
-        # Calculate averages from telemetry
-        avg_speed = 0.0
-        avg_altitude = 0.0
-
-        if telemetry:
-            speeds = []
-            altitudes = []
-            for t in telemetry:
-                speeds.append(t.get("groundspeed", 0) or 0)
-                location = t.get("location", "{}")
-                if isinstance(location, str):
-                    try:
-                        location = json.loads(location)
-                    except:
-                        location = {}
-                altitudes.append(location.get("alt", 0) or 0)
-
-            if speeds:
-                avg_speed = sum(speeds) / len(speeds)
-            if altitudes:
-                avg_altitude = sum(altitudes) / len(altitudes)
+        # Averages are computed by SQLite, no telemetry rows are loaded
+        aggregates = await self.drone_repository.get_flight_aggregates(int(flight_id))
+        avg_speed = aggregates["avg_speed"]
+        avg_altitude = aggregates["avg_altitude"]
 
         return {
             "flightId": flight.get("id"),
@@ -75,14 +56,15 @@ class FlightService:
 
     def _format_flight(self, flight: dict) -> dict:
         """Format flight data to camelCase for frontend"""
+        # FlightRepository always returns every key, no defaults needed
         return {
-            "id": flight.get("id"),
-            "date": flight.get("date"),
-            "duration": flight.get("duration"),
-            "pigeonsDetected": flight.get("pigeons_detected", 0),
-            "status": flight.get("status"),
-            "startTime": flight.get("start_time"),
-            "endTime": flight.get("end_time")
+            "id": flight["id"],
+            "date": flight["date"],
+            "duration": flight["duration"],
+            "pigeonsDetected": flight["pigeons_detected"],
+            "status": flight["status"],
+            "startTime": flight["start_time"],
+            "endTime": flight["end_time"]
         }
 
     def _format_telemetry(self, telemetry: dict) -> dict:
@@ -93,13 +75,13 @@ class FlightService:
 
         if isinstance(location, str):
             try:
-                location = json.loads(location)
-            except:
+                location = orjson.loads(location)
+            except orjson.JSONDecodeError:
                 location = {}
         if isinstance(attitude, str):
             try:
-                attitude = json.loads(attitude)
-            except:
+                attitude = orjson.loads(attitude)
+            except orjson.JSONDecodeError:
                 attitude = {}
 
         return {
@@ -6,54 +6,105 @@ Stores flight data and telemetry records
 
 import sqlite3
 import os
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional
 
 # Database path
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scarecrow.db")
 
+# Table and index definitions
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+
+# Cached connections per thread (one read-write, one read-only)
+_tls = threading.local()
+
+# Telemetry rows are queued and written in batches by a background thread,
+# so a slow disk never stalls the flight loop
+TELEMETRY_BATCH_SIZE = 50       # write as soon as this many rows wait...
+TELEMETRY_FLUSH_SECONDS = 2.0   # ...and at least this often
+TELEMETRY_QUEUE_SIZE = 2048     # oldest rows are dropped beyond this
+TELEMETRY_FLUSH_TIMEOUT = 5.0   # longest flush_telemetry() waits for the writer
+_telemetry_queue = queue.Queue(maxsize=TELEMETRY_QUEUE_SIZE)
+_telemetry_wakeup = threading.Event()
+_telemetry_writer = None
+_telemetry_writer_lock = threading.Lock()
+# Rows recorded but not yet written; the writer notifies after each batch
+_telemetry_pending = 0
+_telemetry_pending_changed = threading.Condition()
+
+# Same SQL text every flush, so sqlite3 reuses the compiled statement
+_INSERT_TELEMETRY_SQL = (
+    "INSERT INTO telemetry "
+    "(flight_id, timestamp, mode, armed, location, attitude, groundspeed) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _open_connection(read_only: bool = False):
+    """Open and tune a new database connection"""
+    if read_only:
+        uri = Path(DB_PATH).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None)
+    else:
+        # Autocommit: every statement commits on its own
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+    # Per-connection tuning (WAL itself is persisted by init_database)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache, kept warm
+    return conn
+
 
 def get_connection():
-    """Get database connection"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+    """Get this thread's read-write connection (opened on first use)"""
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = _open_connection()
+        _tls.conn = conn
     return conn
 
 
+def get_read_connection():
+    """Get this thread's read-only connection (WAL readers never block the writer)"""
+    conn = getattr(_tls, "read_conn", None)
+    if conn is None:
+        conn = _open_connection(read_only=True)
+        _tls.read_conn = conn
+    return conn
+
+
+@contextmanager
+def transaction(conn):
+    """Run the enclosed statements in one transaction (connections are autocommit)"""
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
 def init_database():
     """Initialize database with tables"""
     conn = get_connection()
-    cursor = conn.cursor()
+    # WAL lets the API read while telemetry is written during a flight
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA wal_autocheckpoint=1000")
 
-    # Flights table - one record per flight
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS flights (
-            flight_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            start_time DATETIME NOT NULL,
-            end_time DATETIME,
-            status TEXT DEFAULT 'in_progress',
-            notes TEXT
-        )
-    ''')
+    # Tables and indexes (shared with the backend)
+    with open(SCHEMA_PATH) as f:
+        conn.executescript(f.read())
 
-    # Telemetry table - one record per second during flight
-    # Mode is always MANUAL (no GPS)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS telemetry (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            flight_id INTEGER NOT NULL,
-            timestamp DATETIME NOT NULL,
-            mode TEXT,
-            armed INTEGER,
-            location TEXT,
-            attitude TEXT,
-            groundspeed REAL,
-            FOREIGN KEY (flight_id) REFERENCES flights (flight_id)
-        )
-    ''')
+    # Refresh planner statistics
+    conn.execute('ANALYZE')
 
-    conn.commit()
-    conn.close()
     print(f"Database initialized at: {DB_PATH}")
 
 
@@ -72,14 +123,13 @@ def start_flight(notes: str = None) -> int:
     ''', (datetime.now(), notes))
 
     flight_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
 
     return flight_id
 
 
 def end_flight(flight_id: int, status: str = 'completed'):
     """End a flight"""
+    flush_telemetry()
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -89,32 +139,53 @@ def end_flight(flight_id: int, status: str = 'completed'):
         WHERE flight_id = ?
     ''', (datetime.now(), status, flight_id))
 
-    conn.commit()
-    conn.close()
-
 
 def get_flight(flight_id: int) -> Optional[Dict]:
     """Get flight by ID"""
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     cursor.execute('SELECT * FROM flights WHERE flight_id = ?', (flight_id,))
     row = cursor.fetchone()
-    conn.close()
 
     if row:
         return dict(row)
     return None
 
 
-def get_all_flights() -> List[Dict]:
-    """Get all flights"""
-    conn = get_connection()
+def get_all_flights(limit: int = 100, before_id: int = None) -> List[Dict]:
+    """Get flights newest first, one page at a time
+
+    Pass the flight_id of the last flight of a page as before_id to get
+    the next (older) page. Raises ValueError if before_id does not exist.
+    """
+    conn = get_read_connection()
     cursor = conn.cursor()
 
-    cursor.execute('SELECT * FROM flights ORDER BY start_time DESC')
+    if before_id is None:
+        cursor.execute('''
+            SELECT flight_id, start_time, end_time, status, notes
+            FROM flights
+            ORDER BY start_time DESC, flight_id DESC
+            LIMIT ?
+        ''', (limit,))
+    else:
+        cursor.execute(
+            'SELECT start_time FROM flights WHERE flight_id = ?', (before_id,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"Flight {before_id} not found")
+
+        # Flights sharing a start_time are ordered by flight_id, so none are skipped
+        cursor.execute('''
+            SELECT flight_id, start_time, end_time, status, notes
+            FROM flights
+            WHERE (start_time, flight_id) < (?, ?)
+            ORDER BY start_time DESC, flight_id DESC
+            LIMIT ?
+        ''', (row[0], before_id, limit))
     rows = cursor.fetchall()
-    conn.close()
 
     return [dict(row) for row in rows]
 
@@ -125,15 +196,11 @@ def get_all_flights() -> List[Dict]:
 
 def record_telemetry(flight_id: int, mode: str, armed: bool,
                      location: str, attitude: str, groundspeed: float):
-    """Record one telemetry snapshot (called every second)"""
-    conn = get_connection()
-    cursor = conn.cursor()
+    """Record one telemetry snapshot (called every second, never waits on disk)"""
+    global _telemetry_pending
 
-    cursor.execute('''
-        INSERT INTO telemetry (
-            flight_id, timestamp, mode, armed, location, attitude, groundspeed
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (
+    _start_telemetry_writer()
+    row = (
         flight_id,
         datetime.now(),
         mode,
@@ -141,27 +208,111 @@ def record_telemetry(flight_id: int, mode: str, armed: bool,
         location,
         attitude,
         groundspeed
-    ))
+    )
 
-    conn.commit()
-    conn.close()
+    with _telemetry_pending_changed:
+        _telemetry_pending += 1
+    try:
+        _telemetry_queue.put_nowait(row)
+    except queue.Full:
+        # Writer is falling behind: drop the oldest row, keep the newest
+        try:
+            _telemetry_queue.get_nowait()
+            with _telemetry_pending_changed:
+                _telemetry_pending -= 1
+        except queue.Empty:
+            pass
+        _telemetry_queue.put_nowait(row)
+
+    if _telemetry_queue.qsize() >= TELEMETRY_BATCH_SIZE:
+        _telemetry_wakeup.set()
+
+
+def flush_telemetry(timeout: float = TELEMETRY_FLUSH_TIMEOUT) -> bool:
+    """Wait until every queued telemetry row is written
+
+    Returns False if rows are still pending after timeout seconds.
+    """
+    if _telemetry_writer is None:
+        # Nothing was ever recorded by this process
+        return True
+    _telemetry_wakeup.set()
+
+    with _telemetry_pending_changed:
+        return _telemetry_pending_changed.wait_for(
+            lambda: _telemetry_pending == 0, timeout
+        )
 
 
-def get_flight_telemetry(flight_id: int) -> List[Dict]:
-    """Get all telemetry records for a flight"""
-    conn = get_connection()
+def _start_telemetry_writer():
+    """Start the background telemetry writer (once)"""
+    global _telemetry_writer
+
+    if _telemetry_writer is not None:
+        return
+    with _telemetry_writer_lock:
+        if _telemetry_writer is None:
+            _telemetry_writer = threading.Thread(
+                target=_write_telemetry_forever, name="telemetry-writer", daemon=True
+            )
+            _telemetry_writer.start()
+
+
+def _write_telemetry_forever():
+    """Drain queued telemetry in one transaction per batch"""
+    global _telemetry_pending
+
+    while True:
+        _telemetry_wakeup.wait(TELEMETRY_FLUSH_SECONDS)
+        _telemetry_wakeup.clear()
+
+        rows = []
+        while True:
+            try:
+                rows.append(_telemetry_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not rows:
+            continue
+
+        try:
+            with transaction(get_connection()) as conn:
+                conn.executemany(_INSERT_TELEMETRY_SQL, rows)
+        except Exception as e:
+            print(f"Failed to write {len(rows)} telemetry rows: {e}")
+        finally:
+            with _telemetry_pending_changed:
+                _telemetry_pending -= len(rows)
+                _telemetry_pending_changed.notify_all()
+
+
+def get_flight_telemetry(flight_id: int) -> Iterator[sqlite3.Row]:
+    """Iterate over the telemetry records of a flight (rows are streamed, not loaded)"""
+    flush_telemetry()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     cursor.execute('''
-        SELECT * FROM telemetry
+        SELECT id, flight_id, timestamp, mode, armed, location, attitude, groundspeed
+        FROM telemetry
         WHERE flight_id = ?
         ORDER BY timestamp ASC
     ''', (flight_id,))
 
-    rows = cursor.fetchall()
-    conn.close()
+    yield from cursor
 
-    return [dict(row) for row in rows]
+
+def get_flight_telemetry_count(flight_id: int) -> int:
+    """Count the telemetry records of a flight"""
+    flush_telemetry()
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        'SELECT COUNT(*) FROM telemetry WHERE flight_id = ?', (flight_id,)
+    )
+
+    return cursor.fetchone()[0]
 
 
 # =============================================================================
@@ -170,13 +321,18 @@ def get_flight_telemetry(flight_id: int) -> List[Dict]:
 
 def get_flight_stats(flight_id: int) -> Optional[Dict]:
     """Get stats for a flight"""
-    flight = get_flight(flight_id)
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        'SELECT start_time, end_time, status FROM flights WHERE flight_id = ?',
+        (flight_id,)
+    )
+    flight = cursor.fetchone()
     if not flight:
         return None
 
-    telemetry = get_flight_telemetry(flight_id)
-
-    # Calculate duration
+    # Calculate duration (None while the flight is in progress)
     duration = None
     if flight['end_time'] and flight['start_time']:
         start = datetime.fromisoformat(flight['start_time'])
@@ -189,7 +345,7 @@ def get_flight_stats(flight_id: int) -> Optional[Dict]:
         'end_time': flight['end_time'],
         'duration_seconds': duration,
         'status': flight['status'],
-        'telemetry_records': len(telemetry)
+        'telemetry_records': get_flight_telemetry_count(flight_id)
     }
 
 
@@ -225,5 +381,5 @@ if __name__ == "__main__":
     print(f"\nFlight stats: {stats}")
 
     # Get telemetry
-    telemetry = get_flight_telemetry(flight_id)
+    telemetry = [dict(row) for row in get_flight_telemetry(flight_id)]
     print(f"\nTelemetry: {telemetry}")
@@ -0,0 +1,36 @@
+-- Scarecrow Drone database schema
+-- Applied on startup by database.py (init_database) and by the backend
+-- (DatabaseConnection._configure); every statement must be idempotent
+
+-- Flights table - one record per flight
+CREATE TABLE IF NOT EXISTS flights (
+    flight_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    start_time DATETIME NOT NULL,
+    end_time DATETIME,
+    status TEXT DEFAULT 'in_progress',
+    notes TEXT
+);
+
+-- Telemetry table - one record per second during flight
+-- Mode is always MANUAL (no GPS)
+CREATE TABLE IF NOT EXISTS telemetry (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    flight_id INTEGER NOT NULL,
+    timestamp DATETIME NOT NULL,
+    mode TEXT,
+    armed INTEGER,
+    location TEXT,
+    attitude TEXT,
+    groundspeed REAL,
+    FOREIGN KEY (flight_id) REFERENCES flights (flight_id)
+);
+
+-- Telemetry is always read per flight in time order; the index serves
+-- both the lookup and the ORDER BY
+CREATE INDEX IF NOT EXISTS idx_telemetry_flight_ts
+ON telemetry (flight_id, timestamp);
+
+-- Flight history is listed newest first, paged on (start_time, flight_id);
+-- scanned backwards, the index serves that ORDER BY without a sort
+CREATE INDEX IF NOT EXISTS idx_flights_start_time_id
+ON flights (start_time, flight_id);